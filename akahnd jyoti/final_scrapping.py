@@ -1,10 +1,15 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
 import os
+import hashlib
 import time
 import re
-import json
+import orjson
 from urllib.parse import urljoin
+import concurrent.futures
+import threading
 
 # Define base URL for Akhand Jyoti literature - updated based on search result [6]
 BASE_URL = "http://literature.awgp.org/hindi/akhandjyoti/"
@@ -16,36 +21,163 @@ END_YEAR = 1951
 # Directory to store extracted content
 OUTPUT_DIR = "akhandjyoti_content"
 os.makedirs(OUTPUT_DIR, exist_ok=True)  # Create directory if it doesn't exist
+created_dirs = set()  # Directories already created during this run
 
-# Request counter and delay settings
-request_counter = 0
-DELAY_AFTER_REQUESTS = 3
-DELAY_SECONDS = 10
+# Request rate settings, shared by all workers
+REQUESTS_PER_SECOND = 2.0
+BURST_REQUESTS = 4
+DEFAULT_RETRY_AFTER = 30  # Seconds to back off on a 429 without a usable Retry-After
+RATE_LIMIT_RETRIES = 3  # Times a rate-limited request is tried again after the pause
 
-def make_request(url):
-    """Makes an HTTP request with delay logic implemented"""
-    global request_counter
-    
-    request_counter += 1
-    
-    # Implement delay after every 3 requests
-    if request_counter % DELAY_AFTER_REQUESTS == 0:
-        print(f"Pausing for {DELAY_SECONDS} seconds after {request_counter} requests...")
-        time.sleep(DELAY_SECONDS)
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=30)
-        if response.status_code != 200:
+# Concurrency settings: months download in parallel, but in-flight requests to the host stay capped
+MAX_WORKERS = 6
+MAX_CONCURRENT_REQUESTS = 8
+request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+CHUNK_SIZE = 64 * 1024  # Bytes written per chunk when saving images
+IMAGE_HEADERS = {'Accept-Encoding': 'identity'}  # Images are already compressed; skip gzip
+
+# Only the tags each page type actually needs get built into the soup
+TEXT_STRAINER = SoupStrainer(['div', 'article', 'main', 'section'])
+SCAN_STRAINER = SoupStrainer(['img', 'frame', 'iframe'])
+IMG_STRAINER = SoupStrainer('img')
+
+# Patterns and lookups used on every page, built once
+RE_VBASE = re.compile(r'(.*/v\d+)')
+RE_EXCESS_NL = re.compile(r'\n{3,}')
+CONTENT_SELECTORS = ('div#contentArtcile', 'div.article-content', 'div.content', 'article', 'main')
+SKIP_IMG_SUBSTRINGS = ('icon', 'logo', 'button', 'nav')
+
+# Month names as they appear on the year pages, mapped to the English name
+ENGLISH_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+                  'July', 'August', 'September', 'October', 'November', 'December']
+HINDI_MONTHS = ['जनवरी', 'फरवरी', 'मार्च', 'अप्रैल', 'मई', 'जून',
+                'जुलाई', 'अगस्त', 'सितंबर', 'अक्टूबर', 'नवंबर', 'दिसंबर']
+MONTH_LOOKUP = {**{month: month for month in ENGLISH_MONTHS}, **dict(zip(HINDI_MONTHS, ENGLISH_MONTHS))}
+RE_MONTH = re.compile('|'.join(ENGLISH_MONTHS + HINDI_MONTHS))
+
+# Shared session so every request to the site reuses pooled keep-alive connections.
+# 429 is left out of the retried statuses so make_request can pause every worker
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504],
+                      raise_on_status=False)
+)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
+class TokenBucket:
+    """Thread-safe token bucket that spaces requests just in time, allowing short bursts"""
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.frozen_until = 0
+        self.lock = threading.Lock()
+        
+    def acquire(self):
+        """Takes one token, sleeping until one is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.frozen_until:
+                    wait = self.frozen_until - now
+                else:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            
+    def freeze(self, seconds):
+        """Holds back every caller for the given time, e.g. a server's Retry-After"""
+        with self.lock:
+            self.frozen_until = max(self.frozen_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.updated = self.frozen_until
+
+rate_limiter = TokenBucket(REQUESTS_PER_SECOND, BURST_REQUESTS)
+
+def ensure_dir(path):
+    """Creates a directory once per run; repeat calls are just a set lookup"""
+    if path not in created_dirs:
+        os.makedirs(path, exist_ok=True)
+        created_dirs.add(path)
+
+def make_request(url, extra_headers=None):
+    """Makes an HTTP request, paced by the shared rate limiter"""
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        rate_limiter.acquire()
+        
+        try:
+            with request_slots:
+                response = SESSION.get(url, headers=extra_headers, timeout=30, stream=True)
+        except Exception as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return None
+        
+        if response.status_code == 200:
+            return response
+        response.close()
+        
+        if response.status_code != 429:
             print(f"Failed to fetch {url}, status code: {response.status_code}")
             return None
-        return response
-    except Exception as e:
-        print(f"Error fetching {url}: {str(e)}")
-        return None
+        
+        # Rate limited: hold back every worker, not just this one, then try again
+        retry_after = response.headers.get('Retry-After', '')
+        retry_after = int(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_AFTER
+        print(f"Rate limited. Pausing all requests for {retry_after} seconds...")
+        rate_limiter.freeze(retry_after)
+    
+    print(f"Failed to fetch {url}: still rate limited after {RATE_LIMIT_RETRIES} retries")
+    return None
+
+def save_response(response, filename):
+    """Streams a response body to disk, moving it into place only once complete"""
+    part_file = filename + '.part'
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_file, 'wb') as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        os.replace(part_file, filename)
+    except (requests.RequestException, OSError) as e:
+        print(f"Error downloading {response.url}: {str(e)}")
+        # Don't leave partial downloads lying next to the finished files
+        try:
+            os.remove(part_file)
+        except OSError:
+            pass
+        return False
+    finally:
+        response.close()
+    write_done_marker(filename, size, digest.hexdigest())
+    return True
+
+def write_done_marker(filename, size, sha256):
+    """Records a finished file's size and hash next to it so it can be verified without re-fetching"""
+    with open(filename + '.done', 'wb') as f:
+        f.write(orjson.dumps({'size': size, 'sha256': sha256}))
+
+def save_text(text, filename):
+    """Writes text to disk atomically, so a file under its final name is always complete"""
+    data = text.encode('utf-8')
+    part_file = filename + '.part'
+    with open(part_file, 'wb') as f:
+        f.write(data)
+    os.replace(part_file, filename)
+    write_done_marker(filename, len(data), hashlib.sha256(data).hexdigest())
 
 def get_month_links(year_url):
     """Gets links for all months for a given year"""
@@ -53,91 +185,81 @@ def get_month_links(year_url):
     if not response:
         return {}
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.content, 'lxml', from_encoding=response.encoding)
     months_data = {}
     
-    # Looking directly for "Scan Version" and "Text Version" links
-    english_months = ['January', 'February', 'March', 'April', 'May', 'June',
-                     'July', 'August', 'September', 'October', 'November', 'December']
-    hindi_months = ['जनवरी', 'फरवरी', 'मार्च', 'अप्रैल', 'मई', 'जून',
-                   'जुलाई', 'अगस्त', 'सितंबर', 'अक्टूबर', 'नवंबर', 'दिसंबर']
+    # Looking directly for "Scan Version" and "Text Version" links, walking
+    # the anchors once and assigning each to the nearest month name
+    for link in soup.find_all('a'):
+        link_text = link.get_text().strip()
+        href = link.get('href', '')
+        
+        # Check if this is a scan or text version link
+        is_scan = 'Scan Version' in link_text or 'स्कैन वर्जन' in link_text
+        is_text = 'Text Version' in link_text or 'टेक्स्ट वर्जन' in link_text
+        
+        if not (is_scan or is_text):
+            continue
+        
+        # Find the month this link belongs to by checking nearby text
+        # First check the link's parents, nearest first, for a month name;
+        # stop at the first one wrapping several months (or at body), since
+        # that container doesn't say which of them the link belongs to
+        month_match = None
+        for parent in link.parents:
+            if parent.name in ('body', 'html'):
+                break
+            found = {MONTH_LOOKUP[name] for name in RE_MONTH.findall(parent.get_text())}
+            if len(found) == 1:
+                month_match = found.pop()
+            if found:
+                break
+        
+        # If no direct match, check previous siblings or elements
+        if not month_match:
+            prev_elem = link.find_previous(string=RE_MONTH)
+            if prev_elem:
+                month_match = MONTH_LOOKUP[RE_MONTH.search(prev_elem).group()]
+        
+        # If we found a month match, keep the first link of each version
+        if month_match:
+            versions = months_data.setdefault(month_match, {'scan': None, 'text': None})
+            if is_scan and not versions['scan']:
+                versions['scan'] = urljoin(year_url, href)
+            elif is_text and not versions['text']:
+                versions['text'] = urljoin(year_url, href)
     
-    # Find all links in the page
-    links = soup.find_all('a')
+    # Keep months in calendar order
+    months_data = {month: months_data[month] for month in ENGLISH_MONTHS if month in months_data}
     
-    # Group links by month
-    for month_idx, (eng_month, hi_month) in enumerate(zip(english_months, hindi_months)):
-        scan_link = None
-        text_link = None
-        
-        for link in links:
-            link_text = link.get_text().strip()
-            href = link.get('href', '')
-            
-            # Check if this is a scan or text version link
-            is_scan = 'Scan Version' in link_text or 'स्कैन वर्जन' in link_text
-            is_text = 'Text Version' in link_text or 'टेक्स्ट वर्जन' in link_text
-            
-            if not (is_scan or is_text):
+    # If no months found using the above method, try a more direct approach:
+    # walk the document once, remembering the last month name seen and
+    # giving it the "Scan Version"/"Text Version" links that follow
+    if not months_data:
+        current_month = None
+        for node in (soup.body or soup).descendants:
+            if isinstance(node, NavigableString):
+                match = RE_MONTH.search(node)
+                if match:
+                    current_month = MONTH_LOOKUP[match.group()]
                 continue
             
-            # Find the month this link belongs to by checking nearby text
-            # First check if the link's parent contains month name
-            parent_text = ''.join(parent.get_text() for parent in link.parents if parent.name != 'html')
-            
-            month_match = None
-            if eng_month in parent_text or hi_month in parent_text:
-                month_match = eng_month
+            if node.name != 'a' or not current_month:
+                continue
             
-            # If no direct match, check previous siblings or elements
-            if not month_match:
-                prev_elem = link.find_previous(string=lambda s: s and (eng_month in s or hi_month in s))
-                if prev_elem:
-                    month_match = eng_month
+            link_text = node.get_text().strip()
+            if link_text == 'Scan Version':
+                version = 'scan'
+            elif link_text == 'Text Version':
+                version = 'text'
+            else:
+                continue
             
-            # If we found a month match and this is a valid version link
-            if month_match:
-                if is_scan and not scan_link:
-                    scan_link = urljoin(year_url, href)
-                elif is_text and not text_link:
-                    text_link = urljoin(year_url, href)
+            versions = months_data.setdefault(current_month, {'scan': None, 'text': None})
+            if not versions[version]:
+                versions[version] = urljoin(year_url, node.get('href', ''))
         
-        # If we found links for this month, add them to our results
-        if scan_link or text_link:
-            months_data[eng_month] = {
-                'scan': scan_link,
-                'text': text_link
-            }
-    
-    # If no months found using the above method, try a more direct approach
-    if not months_data:
-        # Look for the specific pattern in result [6]
-        for month in english_months:
-            month_elem = soup.find(string=lambda s: s and month in s)
-            if month_elem:
-                # Find scan and text links after this month
-                next_scan = None
-                next_text = None
-                
-                # Check all scan version links
-                scan_links = soup.find_all('a', string='Scan Version')
-                for link in scan_links:
-                    if month in str(link.previous_element) or month in str(link.previous_sibling):
-                        next_scan = urljoin(year_url, link['href'])
-                        break
-                
-                # Check all text version links
-                text_links = soup.find_all('a', string='Text Version')
-                for link in text_links:
-                    if month in str(link.previous_element) or month in str(link.previous_sibling):
-                        next_text = urljoin(year_url, link['href'])
-                        break
-                
-                if next_scan or next_text:
-                    months_data[month] = {
-                        'scan': next_scan,
-                        'text': next_text
-                    }
+        months_data = {month: months_data[month] for month in ENGLISH_MONTHS if month in months_data}
     
     return months_data
 
@@ -147,7 +269,7 @@ def get_pagination_links(url, max_pages=3):
     page_urls = [url]
     
     # Extract base URL and version number
-    match = re.search(r'(.*/v\d+)', url)
+    match = RE_VBASE.search(url)
     if not match:
         return page_urls  # Return just the original URL if pattern doesn't match
     
@@ -164,7 +286,7 @@ def get_pagination_links(url, max_pages=3):
 def download_text_content(url, output_file):
     """Downloads and saves text content from all pages up to .36"""
     page_urls = get_pagination_links(url)
-    all_text = ""
+    page_texts = []
     content_found = False
     
     for i, page_url in enumerate(page_urls):
@@ -173,12 +295,11 @@ def download_text_content(url, output_file):
         if not response:
             continue
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=TEXT_STRAINER)
         
         # Find the main content - try multiple selectors
         content = None
-        for selector in ['div#contentArtcile', 'div.article-content', 
-                        'div.content', 'article', 'main']:
+        for selector in CONTENT_SELECTORS:
             content = soup.select_one(selector)
             if content and len(content.get_text(strip=True)) > 100:
                 break
@@ -198,19 +319,18 @@ def download_text_content(url, output_file):
         
         # Extract and clean the text
         text = content.get_text(separator='\n\n')
-        text = re.sub(r'\n{3,}', '\n\n', text)  # Clean up excess newlines
+        text = RE_EXCESS_NL.sub('\n\n', text)  # Clean up excess newlines
         
         # Add page marker and content to combined text
-        all_text += f"\n\n--- PAGE {i+1} ---\n\n"
-        all_text += text
+        page_texts.append(f"\n\n--- PAGE {i+1} ---\n\n")
+        page_texts.append(text)
     
     if not content_found:
         print(f"No content found for {url}")
         return False
         
     # Save combined content from all pages
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(all_text)
+    save_text(''.join(page_texts), output_file)
     
     print(f"Saved complete text content to {output_file}")
     return True
@@ -219,7 +339,6 @@ def download_scan_images(url, output_dir):
     """Downloads all scanned images from all pages of a magazine issue"""
     page_urls = get_pagination_links(url, max_pages=2)  # Updated to 66 pages for images
     # page_urls = get_pagination_links(url, max_pages=66)
-    os.makedirs(output_dir, exist_ok=True)
     total_downloaded = 0
     
     for page_index, page_url in enumerate(page_urls):
@@ -228,7 +347,7 @@ def download_scan_images(url, output_dir):
         if not response:
             continue
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=SCAN_STRAINER)
         
         # Find all images that might be scanned pages
         images = soup.find_all('img')
@@ -240,7 +359,8 @@ def download_scan_images(url, output_dir):
             
             # Skip navigation elements, icons, etc.
             src = img['src']
-            if any(x in src.lower() for x in ['icon', 'logo', 'button', 'nav']):
+            src_l = src.lower()
+            if any(x in src_l for x in SKIP_IMG_SUBSTRINGS):
                 continue
             
             # Try to identify substantial content images
@@ -259,7 +379,7 @@ def download_scan_images(url, output_dir):
             
             # Download the image
             img_url = urljoin(page_url, src)
-            img_response = make_request(img_url)
+            img_response = make_request(img_url, IMAGE_HEADERS)
             
             if not img_response:
                 continue
@@ -275,8 +395,8 @@ def download_scan_images(url, output_dir):
             # Save the image with page number in filename for proper ordering
             filename = os.path.join(output_dir, f"page_{page_index+1:03d}img{i+1:03d}.{ext}")
             
-            with open(filename, 'wb') as f:
-                f.write(img_response.content)
+            if not save_response(img_response, filename):
+                continue
             
             page_downloaded += 1
             total_downloaded += 1
@@ -291,40 +411,131 @@ def download_scan_images(url, output_dir):
                     frame_response = make_request(frame_url)
                     
                     if frame_response:
-                        frame_soup = BeautifulSoup(frame_response.text, 'html.parser')
+                        frame_soup = BeautifulSoup(frame_response.content, 'lxml', parse_only=IMG_STRAINER)
                         frame_images = frame_soup.find_all('img')
                         
                         for k, img in enumerate(frame_images):
                             if 'src' in img.attrs:
                                 img_url = urljoin(frame_url, img['src'])
-                                img_response = make_request(img_url)
+                                img_response = make_request(img_url, IMAGE_HEADERS)
                                 
                                 if img_response:
                                     filename = os.path.join(output_dir, f"page_{page_index+1:03d}frame{j+1:02d}img{k+1:02d}.jpg")
-                                    with open(filename, 'wb') as f:
-                                        f.write(img_response.content)
-                                    total_downloaded += 1
+                                    if save_response(img_response, filename):
+                                        total_downloaded += 1
     
     print(f"Downloaded {total_downloaded} images across {len(page_urls)} pages to {output_dir}")
     return total_downloaded > 0
 
-def main():
-    """Main function to coordinate the downloading process"""
-    global BASE_URL  # Declare BASE_URL as global so we can modify it
-    
-    # Create metadata file
-    metadata_file = os.path.join(OUTPUT_DIR, "metadata.json")
+def load_metadata(metadata_file, journal_file):
+    """Loads saved metadata and replays any month records journaled after it"""
     metadata = {}
     
     # Load existing metadata if file exists
     if os.path.exists(metadata_file):
         try:
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-        except json.JSONDecodeError:
+            with open(metadata_file, 'rb') as f:
+                metadata = orjson.loads(f.read())
+        except orjson.JSONDecodeError:
             print("Error reading existing metadata file. Creating new one.")
             metadata = {}
     
+    if os.path.exists(journal_file):
+        with open(journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Torn last line from an interrupted run
+                metadata.setdefault(str(record['year']), {})[record['month']] = record
+    
+    return metadata
+
+def append_metadata(journal_file, month_metadata):
+    """Appends a single month's metadata to the journal"""
+    with open(journal_file, 'ab') as f:
+        f.write(orjson.dumps(month_metadata) + b'\n')
+
+def save_metadata(metadata_file, journal_file, metadata):
+    """Writes the full metadata file and drops the journal it now covers"""
+    # Replace the file only once it is fully written, so an interrupted save keeps the old one
+    tmp_file = metadata_file + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_file, metadata_file)
+    if os.path.exists(journal_file):
+        os.remove(journal_file)
+
+def process_month(year, month, versions, year_dir):
+    """Downloads one month's text (or scans as a fallback) and returns its metadata"""
+    print(f"\nProcessing {month} {year}")
+    
+    month_dir = os.path.join(year_dir, month)
+    
+    # Initialize metadata for this month
+    month_metadata = {
+        "year": year,
+        "month": month,
+        "has_text": False,
+        "has_scan": False,
+        "text_source": None,
+        "scan_source": None
+    }
+    
+    # Check if text version is available and download it
+    text_downloaded = False
+    if versions.get('text'):
+        text_file = os.path.join(month_dir, f"{month}_{year}_text.txt")
+        
+        # Check if text file already exists
+        if os.path.exists(text_file):
+            print(f"Text version already exists for {month} {year}")
+            month_metadata["has_text"] = True
+            month_metadata["text_source"] = versions['text']
+            text_downloaded = True
+        else:
+            print(f"Downloading text version for {month} {year}")
+            success = download_text_content(versions['text'], text_file)
+            if success:
+                month_metadata["has_text"] = True
+                month_metadata["text_source"] = versions['text']
+                text_downloaded = True
+    
+    # Only download scanned version if text version is not available or failed to download
+    if not text_downloaded and versions.get('scan'):
+        scan_dir = os.path.join(month_dir, "scanned_pages")
+        ensure_dir(scan_dir)
+        print(f"Downloading scan version for {month} {year} (text not available)")
+        success = download_scan_images(versions['scan'], scan_dir)
+        if success:
+            month_metadata["has_scan"] = True
+            month_metadata["scan_source"] = versions['scan']
+    
+    if not (versions.get('text') or versions.get('scan')):
+        print(f"No versions available for {month} {year}")
+    
+    return month_metadata
+
+def record_result(future, year, month, metadata, journal_file):
+    """Stores a finished month's metadata and journals it to avoid data loss without rewriting the whole file"""
+    try:
+        month_metadata = future.result()
+    except Exception as e:
+        print(f"Error processing {month} {year}: {str(e)}")
+        return
+    
+    metadata[str(year)][month] = month_metadata
+    append_metadata(journal_file, month_metadata)
+
+def main():
+    """Main function to coordinate the downloading process"""
+    global BASE_URL  # Declare BASE_URL as global so we can modify it
+    
+    # Create metadata file, with an append-only journal of months processed since
+    metadata_file = os.path.join(OUTPUT_DIR, "metadata.json")
+    journal_file = os.path.join(OUTPUT_DIR, "metadata.jsonl")
+    metadata = load_metadata(metadata_file, journal_file)
+    
     # First try the current base URL format
     test_year = 1948  # Known to exist from search result [6]
     test_url = f"{BASE_URL}{test_year}"
@@ -350,84 +561,53 @@ def main():
                 BASE_URL = alt_url
                 break
     
-    for year in range(START_YEAR, END_YEAR + 1):
-        year_url = f"{BASE_URL}{year}"
-        print(f"\nProcessing year: {year}")
-        
-        # Create directory for this year
-        year_dir = os.path.join(OUTPUT_DIR, str(year))
-        os.makedirs(year_dir, exist_ok=True)
-        
-        # Initialize year in metadata if not exists
-        if str(year) not in metadata:
-            metadata[str(year)] = {}
-        
-        # Get links for all months
-        months_data = get_month_links(year_url)
-        
-        if not months_data:
-            print(f"No months found for year {year}")
-            continue
-        
-        for month, versions in months_data.items():
-            print(f"\nProcessing {month} {year}")
-            
-            # Create directory for this month
-            month_dir = os.path.join(year_dir, month)
-            os.makedirs(month_dir, exist_ok=True)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    futures = {}
+    try:
+        for year in range(START_YEAR, END_YEAR + 1):
+            year_url = f"{BASE_URL}{year}"
+            print(f"\nProcessing year: {year}")
             
-            # Initialize metadata for this month
-            month_metadata = {
-                "year": year,
-                "month": month,
-                "has_text": False,
-                "has_scan": False,
-                "text_source": None,
-                "scan_source": None
-            }
+            # Create directory for this year
+            year_dir = os.path.join(OUTPUT_DIR, str(year))
+            ensure_dir(year_dir)
             
-            # Check if text version is available and download it
-            text_downloaded = False
-            if versions.get('text'):
-                text_file = os.path.join(month_dir, f"{month}_{year}_text.txt")
-                
-                # Check if text file already exists
-                if os.path.exists(text_file):
-                    print(f"Text version already exists for {month} {year}")
-                    month_metadata["has_text"] = True
-                    month_metadata["text_source"] = versions['text']
-                    text_downloaded = True
-                else:
-                    print(f"Downloading text version for {month} {year}")
-                    success = download_text_content(versions['text'], text_file)
-                    if success:
-                        month_metadata["has_text"] = True
-                        month_metadata["text_source"] = versions['text']
-                        text_downloaded = True
+            # Initialize year in metadata if not exists
+            if str(year) not in metadata:
+                metadata[str(year)] = {}
             
-            # Only download scanned version if text version is not available or failed to download
-            if not text_downloaded and versions.get('scan'):
-                scan_dir = os.path.join(month_dir, "scanned_pages")
-                print(f"Downloading scan version for {month} {year} (text not available)")
-                success = download_scan_images(versions['scan'], scan_dir)
-                if success:
-                    month_metadata["has_scan"] = True
-                    month_metadata["scan_source"] = versions['scan']
+            # Get links for all months
+            months_data = get_month_links(year_url)
             
-            if not (versions.get('text') or versions.get('scan')):
-                print(f"No versions available for {month} {year}")
+            if not months_data:
+                print(f"No months found for year {year}")
+                continue
             
-            # Save metadata for this month
-            metadata[str(year)][month] = month_metadata
+            # Create every month directory up front instead of inside the workers
+            for month in months_data:
+                ensure_dir(os.path.join(year_dir, month))
             
-            # Update metadata file after each month to avoid data loss
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            # Months are independent, so queue them all to download in parallel
+            for month, versions in months_data.items():
+                futures[executor.submit(process_month, year, month, versions, year_dir)] = (year, month)
+        
+        # Record months as they finish; only this thread touches metadata and the journal
+        for future in concurrent.futures.as_completed(futures):
+            year, month = futures.pop(future)  # Whatever is left unrecorded is handled below
+            record_result(future, year, month, metadata, journal_file)
+    finally:
+        # After an error or KeyboardInterrupt, drop the months still queued, wait for
+        # those already downloading, and record every month that finished
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future, (year, month) in futures.items():
+            if not future.cancelled():
+                record_result(future, year, month, metadata, journal_file)
+        save_metadata(metadata_file, journal_file, metadata)
     
     print(f"\nDownload process completed! Content saved to {OUTPUT_DIR}")
     print(f"Metadata saved to {metadata_file}")
 
-if _name_ == "_main_":
+if __name__ == "__main__":
     main()
 
 #only non text ke scan
\ No newline at end of file
@@ -1,17 +1,29 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
 import os
+import hashlib
 import time
 import re
-import json
+import orjson
+import sqlite3
 from urllib.parse import urljoin
 import concurrent.futures
+import threading
 import torch
 from fake_useragent import UserAgent
 import random
 import logging
 from tqdm import tqdm
-import hashlib
+import xxhash
+
+class TqdmHandler(logging.StreamHandler):
+    """Writes console log lines through tqdm so they print above the progress bars"""
+    def emit(self, record):
+        try:
+            tqdm.write(self.format(record), file=self.stream)
+        except Exception:
+            self.handleError(record)
 
 # Configure logging
 logging.basicConfig(
@@ -19,7 +31,7 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler('akhandjyoti_scraper.log'),
-        logging.StreamHandler()
+        TqdmHandler()
     ]
 )
 
@@ -33,32 +45,110 @@ END_YEAR = 2023  # Adjust as needed
 # Directory to store extracted content
 OUTPUT_DIR = "akhandjyoti_content"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+created_dirs = set()  # Directories already created during this run
+metadata_lock = threading.Lock()  # Guards the shared metadata dict and database connection
+stop_event = threading.Event()  # Set when the run is ending so workers stop starting new months
 
 # Request configuration
 MAX_CONCURRENT_REQUESTS = 8  # Conservative to avoid blocks
-MIN_DELAY = 0.5  # Minimum delay between requests in seconds
+MONTH_WORKERS = 4  # Months of a year downloaded in parallel
+YEAR_WORKERS = int(os.environ.get("SCRAPER_PARALLEL", "1"))  # Years processed in parallel
+REQUESTS_PER_SECOND = 2.0  # Sustained request rate shared by all workers
+BURST_REQUESTS = 4  # Requests allowed back to back after an idle spell
+MAX_RATE_LIMIT_PAUSE = 300  # Longest pause honoured from an X-RateLimit-Reset header
+EPOCH_THRESHOLD = 1e9  # X-RateLimit-Reset values above this are epoch timestamps, not seconds
+REQUEST_JITTER = (0.1, 0.5)  # Random delay in seconds before each request so workers don't fire in lockstep
 MAX_RETRIES = 3  # Maximum retries for failed requests
+DEFAULT_RETRY_AFTER = 30  # Seconds to back off on a 429 without a usable Retry-After
 TIMEOUT = 30  # Request timeout in seconds
+CHUNK_SIZE = 64 * 1024  # Bytes written per chunk when saving images
+IMAGE_HEADERS = {'Accept-Encoding': 'identity'}  # Images are already compressed; skip gzip
 
 # Session management
 SESSION_DURATION = 300  # 5 minutes
 SESSION_REQUESTS = 100  # Max requests per session
 PROXY_LIST = []  # Add proxies if available
+USER_AGENT_POOL_SIZE = 64  # User agents sampled once up front and rotated per session
+POOL_CONNECTIONS = 16  # Per-host connection pools kept by each session
+POOL_MAXSIZE = 32  # Keep-alive connections kept per host
+
+# Patterns and lookups used on every page, built once
+RE_EXCESS_NL = re.compile(r'\n{3,}')
+RE_PAGE_SUFFIX = re.compile(r'\.(\d+)$')
+# Opening tag whose class list contains the exact token "pagination"
+RE_PAGINATION = re.compile(
+    rb'''<(\w+)\b[^>]*\sclass=(["'])(?:[^"']*\s)?pagination(?:\s[^"']*)?\2[^>]*>''',
+    re.IGNORECASE
+)
+RE_ANCHOR = re.compile(rb'<a\b[^>]*>(.*?)</a>', re.DOTALL | re.IGNORECASE)
+RE_TAG = re.compile(rb'<[^>]*>')
+CONTENT_SELECTORS = (
+    'div#contentArtcile', 'div.article-content', 'div.content',
+    'article', 'main', 'div.post-content', 'div.entry-content'
+)
+SKIP_IMG_SUBSTRINGS = ('icon', 'logo', 'button', 'nav')
+
+# Month names as they appear on the year pages, mapped to the English name
+ENGLISH_MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
+                  'July', 'August', 'September', 'October', 'November', 'December']
+HINDI_MONTHS = ['जनवरी', 'फरवरी', 'मार्च', 'अप्रैल', 'मई', 'जून',
+                'जुलाई', 'अगस्त', 'सितंबर', 'अक्टूबर', 'नवंबर', 'दिसंबर']
+MONTH_LOOKUP = {**{month: month for month in ENGLISH_MONTHS}, **dict(zip(HINDI_MONTHS, ENGLISH_MONTHS))}
+RE_MONTH = re.compile('|'.join(ENGLISH_MONTHS + HINDI_MONTHS))
 
 # Initialize GPU if available
 device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 if str(device) == 'cuda':
     logging.info(f"Using GPU acceleration: {torch.cuda.get_device_name(0)}")
 
+class TokenBucket:
+    """Thread-safe token bucket that spaces requests just in time, allowing short bursts"""
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.frozen_until = 0
+        self.lock = threading.Lock()
+        
+    def acquire(self):
+        """Takes one token, sleeping until one is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.frozen_until:
+                    wait = self.frozen_until - now
+                else:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            
+    def freeze(self, seconds):
+        """Holds back every caller for the given time, e.g. a server's Retry-After"""
+        with self.lock:
+            self.frozen_until = max(self.frozen_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.updated = self.frozen_until
+
 class RequestManager:
     def __init__(self):
-        self.session = requests.Session()
-        self.user_agent = UserAgent()
-        self.last_request_time = 0
+        user_agent = UserAgent()
+        self.user_agents = [user_agent.random for _ in range(USER_AGENT_POOL_SIZE)]
+        self.session = self.new_session()
         self.request_count = 0
         self.session_start = time.time()
         self.proxy_rotation = False
         
+        # Shared by all worker threads: the bucket paces requests, the lock
+        # guards session state, the semaphore caps requests in flight
+        self.bucket = TokenBucket(REQUESTS_PER_SECOND, BURST_REQUESTS)
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        
         if PROXY_LIST:
             self.proxy_rotation = True
             self.current_proxy = 0
@@ -70,106 +160,179 @@ class RequestManager:
         self.current_proxy += 1
         return {'http': proxy, 'https': proxy}
     
+    def new_session(self):
+        """Creates a pooled keep-alive session carrying the static headers and a fresh user agent"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Referer': BASE_URL,
+            'DNT': '1'
+        })
+        return session
+    
     def rotate_session(self):
         self.session.close()
-        self.session = requests.Session()
+        self.session = self.new_session()
         self.session_start = time.time()
         self.request_count = 0
         
-    def make_request(self, url):
-        # Implement intelligent rate limiting
-        elapsed = time.time() - self.last_request_time
-        if elapsed < MIN_DELAY:
-            time.sleep(MIN_DELAY - elapsed)
+    def wait_for_turn(self):
+        """Waits for a rate-limit token and returns the session and proxies to use"""
+        time.sleep(random.uniform(*REQUEST_JITTER))
+        self.bucket.acquire()
+        with self.lock:
+            # Rotate session if needed
+            if (time.time() - self.session_start > SESSION_DURATION or 
+                self.request_count >= SESSION_REQUESTS):
+                self.rotate_session()
             
-        # Rotate session if needed
-        if (time.time() - self.session_start > SESSION_DURATION or 
-            self.request_count >= SESSION_REQUESTS):
-            self.rotate_session()
-            
-        headers = {
-            'User-Agent': self.user_agent.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Referer': BASE_URL,
-            'DNT': '1'
-        }
+            return self.session, self.get_proxy()
+    
+    def update_rate_limit(self, response):
+        """Pauses all workers when the server reports an exhausted rate-limit window"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(remaining)
+            reset = float(reset)
+        except ValueError:
+            return
+        if remaining > 0:
+            return
         
-        proxies = self.get_proxy()
+        # Reset is sent either as an epoch timestamp or as seconds to wait;
+        # a timestamp already in the past (clock skew, slow response) means no wait
+        wait = reset - time.time() if reset > EPOCH_THRESHOLD else reset
+        wait = min(max(0.0, wait), MAX_RATE_LIMIT_PAUSE)
+        if wait <= 0:
+            return
+        logging.warning(f"Rate limit window exhausted. Pausing until reset in {wait:.1f} seconds")
+        self.bucket.freeze(wait)
         
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = self.session.get(
-                    url,
-                    headers=headers,
-                    proxies=proxies,
-                    timeout=TIMEOUT,
-                    stream=True
-                )
-                
-                if response.status_code == 200:
-                    self.last_request_time = time.time()
-                    self.request_count += 1
-                    return response
-                elif response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', 30))
-                    logging.warning(f"Rate limited. Waiting {retry_after} seconds...")
-                    time.sleep(retry_after)
-                    continue
-                else:
-                    logging.warning(f"Request failed with status {response.status_code} on attempt {attempt + 1}")
-                    time.sleep(2 ** attempt)  # Exponential backoff
-            except Exception as e:
-                logging.warning(f"Request error on attempt {attempt + 1}: {str(e)}")
-                time.sleep(2 ** attempt)
+    def make_request(self, url, extra_headers=None):
+        with self.slots:
+            for attempt in range(MAX_RETRIES):
+                # Implement intelligent rate limiting
+                session, proxies = self.wait_for_turn()
+                try:
+                    response = session.get(
+                        url,
+                        headers=extra_headers,
+                        proxies=proxies,
+                        timeout=TIMEOUT,
+                        stream=True
+                    )
+                    self.update_rate_limit(response)
+                    
+                    if response.status_code == 200:
+                        with self.lock:
+                            self.request_count += 1
+                        return response
+                    
+                    # Release the pooled connection before retrying
+                    response.close()
+                    if response.status_code == 429:
+                        retry_after = response.headers.get('Retry-After', '')
+                        retry_after = int(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_AFTER
+                        logging.warning(f"Rate limited. Pausing all requests for {retry_after} seconds...")
+                        self.bucket.freeze(retry_after)
+                        continue
+                    else:
+                        logging.warning(f"Request failed with status {response.status_code} on attempt {attempt + 1}")
+                        time.sleep(2 ** attempt)  # Exponential backoff
+                except Exception as e:
+                    logging.warning(f"Request error on attempt {attempt + 1}: {str(e)}")
+                    time.sleep(2 ** attempt)
                 
         return None
 
 # Initialize request manager
 request_manager = RequestManager()
 
+def ensure_dir(path):
+    """Creates a directory once per run; repeat calls are just a set lookup"""
+    if path not in created_dirs:
+        os.makedirs(path, exist_ok=True)
+        created_dirs.add(path)
+
+def save_response(response, filename):
+    """Streams a response body to disk, moving it into place only once complete"""
+    part_file = filename + '.part'
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_file, 'wb') as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        os.replace(part_file, filename)
+    except (requests.RequestException, OSError) as e:
+        logging.warning(f"Error downloading {response.url}: {str(e)}")
+        # Don't leave partial downloads lying next to the finished files
+        try:
+            os.remove(part_file)
+        except OSError:
+            pass
+        return False
+    finally:
+        response.close()
+    write_done_marker(filename, size, digest.hexdigest())
+    return True
+
+def write_done_marker(filename, size, sha256):
+    """Records a finished file's size and hash next to it so it can be verified without re-fetching"""
+    with open(filename + '.done', 'wb') as f:
+        f.write(orjson.dumps({'size': size, 'sha256': sha256}))
+
+def save_text(text, filename):
+    """Writes text to disk atomically, so a file under its final name is always complete"""
+    data = text.encode('utf-8')
+    part_file = filename + '.part'
+    with open(part_file, 'wb') as f:
+        f.write(data)
+    os.replace(part_file, filename)
+    write_done_marker(filename, len(data), hashlib.sha256(data).hexdigest())
+
 def get_month_links(year_url):
     """Gets links for all months for a given year with improved parsing"""
     response = request_manager.make_request(year_url)
     if not response:
         return {}
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    tree = LexborHTMLParser(response.content)
     months_data = {}
     
-    # Predefined month names in English and Hindi
-    english_months = ['January', 'February', 'March', 'April', 'May', 'June',
-                     'July', 'August', 'September', 'October', 'November', 'December']
-    hindi_months = ['जनवरी', 'फरवरी', 'मार्च', 'अप्रैल', 'मई', 'जून',
-                   'जुलाई', 'अगस्त', 'सितंबर', 'अक्टूबर', 'नवंबर', 'दिसंबर']
-    
     # Find all elements that might contain month information
-    potential_elements = soup.find_all(['div', 'tr', 'li', 'p', 'table'])
+    potential_elements = tree.css('div, tr, li, p, table')
     
     for element in potential_elements:
-        text = element.get_text().strip()
+        text = element.text().strip()
         
         # Check for month names in the element
-        found_month = None
-        for eng_month, hi_month in zip(english_months, hindi_months):
-            if eng_month in text or hi_month in text:
-                found_month = eng_month
-                break
-                
-        if not found_month:
+        match = RE_MONTH.search(text)
+        if not match:
             continue
+        found_month = MONTH_LOOKUP[match.group()]
             
         # Look for scan and text version links within this element
         scan_link = None
         text_link = None
         
-        for link in element.find_all('a'):
-            link_text = link.get_text().strip()
-            href = link.get('href', '')
+        for link in element.css('a'):
+            link_text = link.text().strip().lower()
+            href = link.attributes.get('href') or ''
             
-            if 'scan' in link_text.lower() or 'स्कैन' in link_text.lower():
+            if 'scan' in link_text or 'स्कैन' in link_text:
                 scan_link = urljoin(year_url, href)
-            elif 'text' in link_text.lower() or 'टेक्स्ट' in link_text.lower():
+            elif 'text' in link_text or 'टेक्स्ट' in link_text:
                 text_link = urljoin(year_url, href)
                 
         if scan_link or text_link:
@@ -180,29 +343,39 @@ def get_month_links(year_url):
     
     return months_data
 
+def pagination_block(page):
+    """Returns the markup inside the first element with the "pagination" class, or None"""
+    opening = RE_PAGINATION.search(page)
+    if not opening:
+        return None
+    
+    # Find the matching close tag, counting nested elements of the same name
+    tag = re.compile(rb'<(/?)' + re.escape(opening.group(1)) + rb'\b[^>]*>', re.IGNORECASE)
+    depth = 1
+    for match in tag.finditer(page, opening.end()):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return page[opening.end():match.start()]
+    return page[opening.end():]
+
 def get_pagination_links(url, max_pages=36):
     """Generates pagination links with intelligent page count detection"""
     page_urls = [url]
+    first_page = None  # Returned too so callers don't fetch the first page twice
     
     # First try to detect actual page count from the first page
     response = request_manager.make_request(url)
     if response:
-        soup = BeautifulSoup(response.text, 'html.parser')
+        first_page = response.content
         
-        # Look for pagination elements
-        pagination = soup.find(class_='pagination') or soup.find(id='pagination')
-        if pagination:
-            page_links = pagination.find_all('a')
-            max_detected = 0
-            for link in page_links:
-                try:
-                    page_num = int(link.get_text())
-                    if page_num > max_detected:
-                        max_detected = page_num
-                except ValueError:
-                    pass
-                    
-            if max_detected > 0:
+        # Read the page count straight from the pagination markup rather than parsing the page
+        pagination = pagination_block(first_page)
+        if pagination is not None:
+            link_texts = (RE_TAG.sub(b'', text).strip() for text in RE_ANCHOR.findall(pagination))
+            page_numbers = [int(text) for text in link_texts if text.isdigit()]
+            max_detected = max(page_numbers, default=0)
+            # A count below the number of page links seen can't be the page count
+            if max_detected >= max(len(page_numbers), 1):
                 max_pages = min(max_pages, max_detected)
     
     # Generate page URLs
@@ -210,24 +383,27 @@ def get_pagination_links(url, max_pages=36):
         page_url = f"{url}.{page}" if '.' not in url else f"{url[:-2]}.{page}"
         page_urls.append(page_url)
     
-    return page_urls
+    return page_urls, first_page
 
 def download_text_content(url, output_file):
     """Downloads text content with parallel processing"""
-    page_urls = get_pagination_links(url)
-    all_text = ""
+    page_urls, first_page = get_pagination_links(url)
+    page_texts = []
     content_found = False
     
     # Use ThreadPoolExecutor for parallel downloads
     with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
-        future_to_url = {executor.submit(process_text_page, page_url): page_url for page_url in page_urls}
+        future_to_url = {
+            executor.submit(process_text_page, page_url, first_page if i == 0 else None): page_url
+            for i, page_url in enumerate(page_urls)
+        }
         
-        for future in tqdm(concurrent.futures.as_completed(future_to_url), total=len(page_urls), desc="Downloading pages"):
+        for future in tqdm(concurrent.futures.as_completed(future_to_url), total=len(page_urls), desc="Downloading pages", mininterval=0.5):
             page_url = future_to_url[future]
             try:
                 page_text = future.result()
                 if page_text:
-                    all_text += page_text
+                    page_texts.append(page_text)
                     content_found = True
             except Exception as e:
                 logging.warning(f"Error processing {page_url}: {str(e)}")
@@ -236,230 +412,373 @@ def download_text_content(url, output_file):
         return False
         
     # Save combined content
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(all_text)
+    save_text(''.join(page_texts), output_file)
     
     return True
 
-def process_text_page(page_url):
-    """Processes a single text page (for parallel execution)"""
-    response = request_manager.make_request(page_url)
-    if not response:
-        return None
+def process_text_page(page_url, content=None):
+    """Processes a single text page (for parallel execution), reusing content if already fetched"""
+    if content is None:
+        response = request_manager.make_request(page_url)
+        if not response:
+            return None
+        content = response.content
         
-    soup = BeautifulSoup(response.text, 'html.parser')
+    tree = LexborHTMLParser(content)
     
     # Find main content using multiple selectors
-    content_selectors = [
-        'div#contentArtcile', 'div.article-content', 'div.content',
-        'article', 'main', 'div.post-content', 'div.entry-content'
-    ]
-    
     content = None
-    for selector in content_selectors:
-        content = soup.select_one(selector)
-        if content and len(content.get_text(strip=True)) > 100:
+    for selector in CONTENT_SELECTORS:
+        content = tree.css_first(selector)
+        if content and len(content.text(strip=True)) > 100:
             break
             
     if not content:
         # Fallback: find largest text block
-        text_blocks = [tag for tag in soup.find_all(['div', 'article', 'section']) 
-                      if len(tag.get_text(strip=True)) > 500]
+        text_blocks = [node for node in tree.css('div, article, section')
+                      if len(node.text(strip=True)) > 500]
         if text_blocks:
-            content = max(text_blocks, key=lambda tag: len(tag.get_text(strip=True)))
+            content = max(text_blocks, key=lambda node: len(node.text(strip=True)))
     
     if not content:
         return None
         
     # Extract and clean text
-    text = content.get_text(separator='\n\n')
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = content.text(separator='\n\n')
+    text = RE_EXCESS_NL.sub('\n\n', text)
     
     # Add page marker
-    page_num = re.search(r'\.(\d+)$', page_url)
+    page_num = RE_PAGE_SUFFIX.search(page_url)
     page_num = page_num.group(1) if page_num else "1"
     return f"\n\n--- PAGE {page_num} ---\n\n{text}"
 
 def download_scan_images(url, output_dir):
     """Downloads scanned images with parallel processing"""
-    page_urls = get_pagination_links(url, max_pages=66)
-    os.makedirs(output_dir, exist_ok=True)
+    page_urls, first_page = get_pagination_links(url, max_pages=66)
     
-    # Use ThreadPoolExecutor for parallel downloads
+    # Images saved by an earlier run, by filename without extension, so they aren't fetched again
+    existing = {os.path.splitext(entry.name)[0] for entry in os.scandir(output_dir) if entry.is_file()}
+    
+    # Pages and their images share one pool: images are queued as soon as their page is parsed
     with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
-        futures = []
+        page_futures = [
+            executor.submit(collect_scan_images, page_url, page_index, first_page if page_index == 0 else None)
+            for page_index, page_url in enumerate(page_urls)
+        ]
         
-        for page_index, page_url in enumerate(page_urls):
-            futures.append(executor.submit(
-                process_scan_page,
-                page_url,
-                page_index,
-                output_dir
-            ))
+        downloaded = 0
+        image_futures = []
+        for future in concurrent.futures.as_completed(page_futures):
+            try:
+                images = future.result()
+            except Exception as e:
+                logging.warning(f"Error processing scan page: {str(e)}")
+                continue
+            for img_url, basename in images:
+                if basename in existing:
+                    downloaded += 1
+                    continue
+                image_futures.append(executor.submit(download_scan_image, img_url, basename, output_dir))
         
         # Track progress
-        downloaded = 0
-        for future in tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="Downloading scans"):
+        for future in tqdm(concurrent.futures.as_completed(image_futures), total=len(image_futures), desc="Downloading scans", mininterval=0.5):
             try:
                 downloaded += future.result()
             except Exception as e:
-                logging.warning(f"Error processing scan page: {str(e)}")
+                logging.warning(f"Error downloading scan image: {str(e)}")
     
     return downloaded > 0
 
-def process_scan_page(page_url, page_index, output_dir):
-    """Processes a single scan page (for parallel execution)"""
-    response = request_manager.make_request(page_url)
-    if not response:
-        return 0
+def collect_scan_images(page_url, page_index, content=None):
+    """Returns (image URL, file basename) pairs for the scans on a page, reusing content if already fetched"""
+    if content is None:
+        response = request_manager.make_request(page_url)
+        if not response:
+            return []
+        content = response.content
         
-    soup = BeautifulSoup(response.text, 'html.parser')
-    downloaded = 0
+    tree = LexborHTMLParser(content)
+    images = []
     
     # Find all potential image elements
-    img_elements = soup.find_all('img')
+    img_elements = tree.css('img')
     
-    for i, img in enumerate(img_elements):
-        if 'src' not in img.attrs:
+    for img in img_elements:
+        src = img.attributes.get('src')
+        if not src:
             continue
             
-        src = img['src']
-        if any(x in src.lower() for x in ['icon', 'logo', 'button', 'nav']):
+        src_l = src.lower()
+        if any(x in src_l for x in SKIP_IMG_SUBSTRINGS):
             continue
             
         # Skip small images
-        width = img.get('width', '0')
-        height = img.get('height', '0')
+        width = img.attributes.get('width') or '0'
+        height = img.attributes.get('height') or '0'
         try:
             if int(width.replace('px', '')) < 300 or int(height.replace('px', '')) < 300:
                 continue
         except (ValueError, AttributeError):
             pass
             
-        # Download the image
+        # Generate unique filename
         img_url = urljoin(page_url, src)
-        img_response = request_manager.make_request(img_url)
+        img_hash = xxhash.xxh64_hexdigest(img_url.encode())[:8]
+        images.append((img_url, f"page_{page_index+1:03d}_{img_hash}"))
+    
+    return images
+
+def download_scan_image(img_url, basename, output_dir):
+    """Downloads a single scan image, naming it by its content type"""
+    img_response = request_manager.make_request(img_url, IMAGE_HEADERS)
+    
+    if not img_response:
+        return False
         
-        if not img_response:
-            continue
-            
-        # Generate unique filename
-        img_hash = hashlib.md5(img_url.encode()).hexdigest()[:8]
-        ext = 'jpg'
-        content_type = img_response.headers.get('Content-Type', '').lower()
-        if 'png' in content_type:
-            ext = 'png'
-        elif 'gif' in content_type:
-            ext = 'gif'
-            
-        filename = os.path.join(output_dir, f"page_{page_index+1:03d}_{img_hash}.{ext}")
+    ext = 'jpg'
+    content_type = img_response.headers.get('Content-Type', '').lower()
+    if 'png' in content_type:
+        ext = 'png'
+    elif 'gif' in content_type:
+        ext = 'gif'
         
-        with open(filename, 'wb') as f:
-            f.write(img_response.content)
-            
-        downloaded += 1
+    filename = os.path.join(output_dir, f"{basename}.{ext}")
+    return save_response(img_response, filename)
+
+def process_month(year, month, versions, year_dir, month_files=frozenset()):
+    """Downloads one month's text (or scans as a fallback) and returns its metadata"""
+    if stop_event.is_set():
+        return None
+    logging.debug(f"Processing {month} {year}")
     
-    return downloaded
+    month_dir = os.path.join(year_dir, month)
+    
+    # Initialize metadata for this month
+    month_metadata = {
+        "year": year,
+        "month": month,
+        "has_text": False,
+        "has_scan": False,
+        "text_source": None,
+        "scan_source": None
+    }
+    
+    # Try text version first
+    text_downloaded = False
+    if versions.get('text'):
+        text_name = f"{month}_{year}_text.txt"
+        text_file = os.path.join(month_dir, text_name)
+        
+        if text_name not in month_files:
+            logging.info(f"Downloading text version for {month} {year}")
+            success = download_text_content(versions['text'], text_file)
+            if success:
+                month_metadata["has_text"] = True
+                month_metadata["text_source"] = versions['text']
+                text_downloaded = True
+        else:
+            month_metadata["has_text"] = True
+            month_metadata["text_source"] = versions['text']
+            text_downloaded = True
+    
+    # Don't start a scan download once the run is stopping
+    if not text_downloaded and stop_event.is_set():
+        return None
+    
+    # Fall back to scan if text not available
+    if not text_downloaded and versions.get('scan'):
+        scan_dir = os.path.join(month_dir, "scanned_pages")
+        ensure_dir(scan_dir)
+        logging.info(f"Downloading scan version for {month} {year}")
+        success = download_scan_images(versions['scan'], scan_dir)
+        if success:
+            month_metadata["has_scan"] = True
+            month_metadata["scan_source"] = versions['scan']
+    
+    return month_metadata
+
+def process_year(year, metadata, conn):
+    """Downloads every month of a year, recording each into the shared metadata"""
+    if stop_event.is_set():
+        return
+    year_s = str(year)
+    year_url = f"{BASE_URL}{year}"
+    logging.info(f"Processing year: {year}")
+    
+    # Create directory for this year
+    year_dir = os.path.join(OUTPUT_DIR, year_s)
+    ensure_dir(year_dir)
+    
+    # Initialize year in metadata if not exists
+    with metadata_lock:
+        year_meta = metadata.setdefault(year_s, {})
+    
+    # Get links for all months
+    months_data = get_month_links(year_url)
+    
+    if not months_data:
+        logging.warning(f"No months found for year {year}")
+        return
+    
+    # Skip months already recorded as downloaded, deciding from metadata rather than the filesystem
+    with metadata_lock:
+        done = {month for month, cached in year_meta.items() if cached.get("has_text") or cached.get("has_scan")}
+    months_data = {month: versions for month, versions in months_data.items() if month not in done}
+    if not months_data:
+        logging.info(f"All months of {year} already downloaded")
+        return
+    
+    # List the year once: existing month directories need no mkdir, and only
+    # their contents (from an earlier run) need listing
+    existing_months = {entry.name for entry in os.scandir(year_dir) if entry.is_dir()}
+    month_files = {}
+    for month in months_data:
+        month_dir = os.path.join(year_dir, month)
+        if month in existing_months:
+            created_dirs.add(month_dir)
+            month_files[month] = {entry.name for entry in os.scandir(month_dir)}
+        else:
+            ensure_dir(month_dir)
+            month_files[month] = set()
+    
+    # Months are independent, so download them in parallel
+    if stop_event.is_set():
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MONTH_WORKERS) as executor:
+        futures = {
+            executor.submit(process_month, year, month, versions, year_dir, month_files[month]): month
+            for month, versions in months_data.items()
+        }
+        
+        for future in concurrent.futures.as_completed(futures):
+            month = futures[future]
+            try:
+                month_metadata = future.result()
+            except Exception as e:
+                logging.warning(f"Error processing {month} {year}: {str(e)}")
+                continue
+            if month_metadata is None:
+                continue  # Skipped because the run is stopping
+            
+            # Update metadata and store the month; metadata.json is only regenerated as years finish
+            with metadata_lock:
+                year_meta[month] = month_metadata
+                record_month(conn, month_metadata)
+
+def open_metadata_db(db_file):
+    """Opens the SQLite store holding one row per processed month, creating it if needed"""
+    conn = sqlite3.connect(db_file, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS months (
+            year INTEGER,
+            month TEXT,
+            has_text INTEGER,
+            has_scan INTEGER,
+            text_source TEXT,
+            scan_source TEXT,
+            PRIMARY KEY (year, month)
+        )
+    """)
+    return conn
+
+def record_month(conn, month_metadata, replace=True):
+    """Stores a single month's metadata, keeping any existing row unless replace is set"""
+    conn.execute(
+        f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO months VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            month_metadata["year"],
+            month_metadata["month"],
+            month_metadata["has_text"],
+            month_metadata["has_scan"],
+            month_metadata["text_source"],
+            month_metadata["scan_source"]
+        )
+    )
+
+def load_metadata(conn):
+    """Reads every stored month back into the year -> month dict shape of metadata.json"""
+    metadata = {}
+    year_meta = last_year = None
+    rows = conn.execute(
+        "SELECT year, month, has_text, has_scan, text_source, scan_source FROM months ORDER BY year"
+    )
+    for year, month, has_text, has_scan, text_source, scan_source in rows:
+        # Rows come ordered by year, so only look the year up when it changes
+        if year != last_year:
+            year_meta = metadata.setdefault(str(year), {})
+            last_year = year
+        year_meta[month] = {
+            "year": year,
+            "month": month,
+            "has_text": bool(has_text),
+            "has_scan": bool(has_scan),
+            "text_source": text_source,
+            "scan_source": scan_source
+        }
+    return metadata
+
+def export_json(conn, metadata_file, pretty=False):
+    """Regenerates metadata.json from the database for downstream consumers"""
+    data = orjson.dumps(load_metadata(conn), option=orjson.OPT_INDENT_2 if pretty else 0)
+    tmp_file = metadata_file + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, metadata_file)
 
 def main():
     """Main function with improved error handling and progress tracking"""
-    # Create metadata file
+    # Months are stored in SQLite as they finish; metadata.json is exported from it
     metadata_file = os.path.join(OUTPUT_DIR, "metadata.json")
-    metadata = {}
+    pretty_file = os.path.join(OUTPUT_DIR, "metadata.pretty.json")  # Indented copy, written once at the end
+    conn = open_metadata_db(os.path.join(OUTPUT_DIR, "metadata.db"))
     
-    # Load existing metadata
-    if os.path.exists(metadata_file):
-        try:
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading metadata: {str(e)}")
+    # Carry over months from an existing metadata.json
+    try:
+        with open(metadata_file, 'rb') as f:
+            saved_metadata = orjson.loads(f.read())
+    except FileNotFoundError:
+        saved_metadata = {}
+    except orjson.JSONDecodeError as e:
+        logging.error(f"Error loading metadata: {str(e)}")
+        saved_metadata = {}
+    for year_months in saved_metadata.values():
+        for month_metadata in year_months.values():
+            record_month(conn, month_metadata, replace=False)
+    metadata = load_metadata(conn)
     
     # Initialize progress tracking
     total_years = END_YEAR - START_YEAR + 1
-    years_processed = 0
     
-    with tqdm(total=total_years, desc="Processing years") as pbar:
-        for year in range(START_YEAR, END_YEAR + 1):
-            year_url = f"{BASE_URL}{year}"
-            logging.info(f"Processing year: {year}")
-            
-            # Create directory for this year
-            year_dir = os.path.join(OUTPUT_DIR, str(year))
-            os.makedirs(year_dir, exist_ok=True)
-            
-            # Initialize year in metadata if not exists
-            if str(year) not in metadata:
-                metadata[str(year)] = {}
-            
-            # Get links for all months
-            months_data = get_month_links(year_url)
-            
-            if not months_data:
-                logging.warning(f"No months found for year {year}")
-                pbar.update(1)
-                continue
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=YEAR_WORKERS)
+    try:
+        # Only this thread updates the bar; redraw at most twice a second
+        with tqdm(total=total_years, desc="Processing years", mininterval=0.5, smoothing=0) as pbar:
+            futures = {
+                executor.submit(process_year, year, metadata, conn): year
+                for year in range(START_YEAR, END_YEAR + 1)
+            }
             
-            # Process each month
-            for month, versions in months_data.items():
-                logging.info(f"Processing {month} {year}")
-                
-                # Create directory for this month
-                month_dir = os.path.join(year_dir, month)
-                os.makedirs(month_dir, exist_ok=True)
-                
-                # Initialize metadata for this month
-                month_metadata = {
-                    "year": year,
-                    "month": month,
-                    "has_text": False,
-                    "has_scan": False,
-                    "text_source": None,
-                    "scan_source": None
-                }
-                
-                # Try text version first
-                text_downloaded = False
-                if versions.get('text'):
-                    text_file = os.path.join(month_dir, f"{month}_{year}_text.txt")
-                    
-                    if not os.path.exists(text_file):
-                        logging.info(f"Downloading text version for {month} {year}")
-                        success = download_text_content(versions['text'], text_file)
-                        if success:
-                            month_metadata["has_text"] = True
-                            month_metadata["text_source"] = versions['text']
-                            text_downloaded = True
-                    else:
-                        month_metadata["has_text"] = True
-                        month_metadata["text_source"] = versions['text']
-                        text_downloaded = True
-                
-                # Fall back to scan if text not available
-                if not text_downloaded and versions.get('scan'):
-                    scan_dir = os.path.join(month_dir, "scanned_pages")
-                    logging.info(f"Downloading scan version for {month} {year}")
-                    success = download_scan_images(versions['scan'], scan_dir)
-                    if success:
-                        month_metadata["has_scan"] = True
-                        month_metadata["scan_source"] = versions['scan']
-                
-                # Update metadata
-                metadata[str(year)][month] = month_metadata
+            for future in concurrent.futures.as_completed(futures):
+                year = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.warning(f"Error processing year {year}: {str(e)}")
                 
-                # Save metadata after each month
-                with open(metadata_file, 'w', encoding='utf-8') as f:
-                    json.dump(metadata, f, indent=2, ensure_ascii=False)
-            
-            # Update progress bar
-            pbar.update(1)
-            years_processed += 1
-            
-            # Random delay between years to avoid detection
-            if years_processed % 5 == 0:
-                delay = random.uniform(5, 15)
-                logging.info(f"Random delay of {delay:.1f} seconds to avoid detection")
-                time.sleep(delay)
+                # Update progress bar and export the finished year
+                pbar.update(1)
+                with metadata_lock:
+                    export_json(conn, metadata_file)
+    finally:
+        # Don't start any more years or months after an error or KeyboardInterrupt;
+        # wait for months already downloading so the export below includes them
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+        with metadata_lock:
+            export_json(conn, metadata_file)
+            export_json(conn, pretty_file, pretty=True)
     
     logging.info(f"\nDownload process completed! Content saved to {OUTPUT_DIR}")
     logging.info(f"Metadata saved to {metadata_file}")
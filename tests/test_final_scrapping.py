@@ -0,0 +1,57 @@
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("lxml")
+pytest.importorskip("requests")
+
+SCRIPT = os.path.join(os.path.dirname(__file__), os.pardir, "akahnd jyoti", "final_scrapping.py")
+
+
+class FakeResponse:
+    def __init__(self, html):
+        self.content = html.encode('utf-8')
+        self.encoding = 'utf-8'
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    # The script creates its output directory on import, so keep that out of the checkout
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("final_scrapping", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def month_links(scraper, monkeypatch, html):
+    monkeypatch.setattr(scraper, "make_request", lambda url: FakeResponse(html))
+    return scraper.get_month_links("http://example.org/1950")
+
+
+def test_month_headings_in_one_wrapper(scraper, monkeypatch):
+    html = """<html><body><div id="main">
+        <h3>January</h3>
+        <p><a href="jan/scan">Scan Version</a> <a href="jan/text">Text Version</a></p>
+        <h3>फरवरी</h3>
+        <p><a href="feb/scan">Scan Version</a> <a href="feb/text">Text Version</a></p>
+    </div></body></html>"""
+
+    assert month_links(scraper, monkeypatch, html) == {
+        'January': {'scan': 'http://example.org/jan/scan', 'text': 'http://example.org/jan/text'},
+        'February': {'scan': 'http://example.org/feb/scan', 'text': 'http://example.org/feb/text'},
+    }
+
+
+def test_month_per_table_row(scraper, monkeypatch):
+    html = """<html><body><table>
+        <tr><td>February</td><td><a href="feb/scan">Scan Version</a></td><td><a href="feb/text">Text Version</a></td></tr>
+        <tr><td>January</td><td><a href="jan/scan">Scan Version</a></td><td><a href="jan/text">Text Version</a></td></tr>
+    </table></body></html>"""
+
+    assert month_links(scraper, monkeypatch, html) == {
+        'January': {'scan': 'http://example.org/jan/scan', 'text': 'http://example.org/jan/text'},
+        'February': {'scan': 'http://example.org/feb/scan', 'text': 'http://example.org/feb/text'},
+    }